@@ -6,11 +6,14 @@
 # remembers the chosen folder between sessions using a config file.
 # -------------------------------------------------------------------
 
+import errno                  # Detect cross-device moves (EXDEV)
+import os                     # Fast directory scanning (scandir)
 import shutil                 # Used for moving files
+import stat                   # Interpret st_mode from os.stat results
 from pathlib import Path      # Easier path handling (better than os.path)
 import datetime               # Used for timestamping logs
+import time                   # Cheap per-message time prefix (faster than datetime)
 import sys                    # Used to check for command-line arguments
-from collections import defaultdict  # Used to count categories easily
 
 # -------------------------------------------------------------------
 # CONFIGURATION HANDLING
@@ -19,16 +22,30 @@ from collections import defaultdict  # Used to count categories easily
 
 CONFIG_FILE = Path("organizer_config.txt")   # Stores the chosen folder path
 
+# Cache of the parsed config so repeated calls (e.g. after "change folder")
+# don't re-read the file. Invalidated automatically when the mtime changes.
+_cached_folder = None
+_cached_mtime_ns = None
+
 def load_folder_from_config():
     """
     Loads the saved folder path from organizer_config.txt.
+    The parsed path is cached and only re-read if the file changed on disk.
     If the file doesn't exist or the folder is invalid, user must pick a new one.
     """
+    global _cached_folder, _cached_mtime_ns
+
     if CONFIG_FILE.exists():
+        mtime_ns = CONFIG_FILE.stat().st_mtime_ns
+        if _cached_folder is not None and mtime_ns == _cached_mtime_ns:
+            return _cached_folder
+
         folder = Path(CONFIG_FILE.read_text(encoding="utf-8").strip())
 
         # Check if the saved folder is valid
         if folder.exists() and folder.is_dir():
+            _cached_folder = folder
+            _cached_mtime_ns = mtime_ns
             return folder
         else:
             print(f"\nThe saved folder does not exist anymore:\n{folder}")
@@ -43,6 +60,8 @@ def set_new_directory():
     Asks the user for a folder path, validates it, saves it into organizer_config.txt,
     and returns the valid folder path.
     """
+    global _cached_folder, _cached_mtime_ns
+
     while True:
         print("\nEnter the FULL path of the folder you want to organize.")
         new_path = input("Folder path: ").strip().strip('"')  # Remove extra quotes
@@ -52,20 +71,26 @@ def set_new_directory():
             print("Path cannot be empty.\n")
             continue
 
-        p = Path(new_path)
-
-        # Check if the folder exists
-        if not p.exists():
+        # One stat() answers both "does it exist?" and "is it a folder?"
+        # instead of two separate syscalls.
+        try:
+            st = os.stat(new_path)
+        except OSError:
             print("❌ That folder does NOT exist. Try again.\n")
             continue
 
         # Ensure it's a folder (not a file)
-        if not p.is_dir():
+        if not stat.S_ISDIR(st.st_mode):
             print("❌ That path is NOT a folder. Try again.\n")
             continue
 
-        # Save valid folder path to config file
+        p = Path(new_path)
+
+        # Save valid folder path to config file and refresh the cache
+        # so the next load doesn't hit the disk again.
         CONFIG_FILE.write_text(str(p), encoding="utf-8")
+        _cached_folder = p
+        _cached_mtime_ns = CONFIG_FILE.stat().st_mtime_ns
 
         print(f"\n✔ Folder has been set to:\n  {p}\n")
         return p
@@ -90,17 +115,24 @@ def ensure_log_folder():
     """Creates the log folder if it doesn't already exist."""
     LOG_FOLDER.mkdir(exist_ok=True)
 
-def log(message):
+def session_log_file():
+    """Builds the log file path for this sorting session (one per run)."""
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H%M%S")
+    return LOG_FOLDER / f"log_{timestamp}.txt"
+
+def log(message, fh=None):
     """
-    Prints a message AND writes it into a timestamped log file.
-    Every sorting session gets its own log file.
+    Prints a message AND writes it into the session's log file.
+    The open file handle is passed in so the file is opened ONCE per
+    session instead of once per message (much faster on big folders).
     """
     print(message)
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H%M%S")
-    log_file = LOG_FOLDER / f"log_{timestamp}.txt"
-
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(f"[{datetime.datetime.now():%H:%M:%S}] {message}\n")
+    if fh is not None:
+        fh.write(f"[{time.strftime('%H:%M:%S')}] {message}\n")
+    else:
+        # No session handle → fall back to opening the file ourselves.
+        with open(session_log_file(), "a", encoding="utf-8") as f:
+            f.write(f"[{time.strftime('%H:%M:%S')}] {message}\n")
 
 
 # -------------------------------------------------------------------
@@ -108,42 +140,56 @@ def log(message):
 # Maps file extensions → categories like Images, Music, etc.
 # -------------------------------------------------------------------
 
+# Built ONCE at import time — rebuilding this dict per file was the
+# biggest Python-level cost when sorting thousands of files.
+_EXT_CATEGORY = {
+    # Image formats
+    ".png": "Images", ".jpg": "Images", ".jpeg": "Images", ".gif": "Images",
+    ".bmp": "Images", ".webp": "Images", ".svg": "Images", ".ico": "Images",
+    ".tiff": "Images",
+
+    # Video formats
+    ".mp4": "Videos", ".mkv": "Videos", ".avi": "Videos", ".mov": "Videos",
+    ".wmv": "Videos", ".flv": "Videos", ".webm": "Videos", ".m4v": "Videos",
+
+    # Audio/Music formats
+    ".mp3": "Music", ".wav": "Music", ".flac": "Music", ".aac": "Music",
+    ".ogg": "Music", ".m4a": "Music", ".wma": "Music",
+
+    # Document formats
+    ".pdf": "Documents", ".txt": "Documents", ".doc": "Documents",
+    ".docx": "Documents", ".xls": "Documents", ".xlsx": "Documents",
+    ".ppt": "Documents", ".pptx": "Documents",
+
+    # Programs / installers
+    ".exe": "Programs", ".msi": "Programs", ".deb": "Programs",
+    ".dmg": "Programs",
+
+    # Compressed archives
+    ".zip": "Archives", ".rar": "Archives", ".7z": "Archives",
+    ".tar": "Archives", ".gz": "Archives", ".bz2": "Archives",
+}
+
+# Every category a file can land in — shared by organize() and undo()
+# instead of each building its own set literal per call.
+ALL_CATEGORIES = frozenset({"Images","Videos","Music","Documents","Programs","Archives","Others"})
+
+# Files organize() must NEVER move: this script (whatever it was renamed
+# to), its config file, and the undo log. One frozenset lookup per entry
+# replaces the old hard-coded name compare.
+IGNORED = frozenset({
+    "organizer.py",
+    Path(__file__).name,
+    CONFIG_FILE.name,
+    "last_undo.log",
+})
+
 def get_category(ext):
     """
     Returns the category name for a given file extension.
     If extension is unknown → goes to "Others".
     """
-    ext = ext.lower()
-
-    mapping = {
-        # Image formats
-        ".png": "Images", ".jpg": "Images", ".jpeg": "Images", ".gif": "Images",
-        ".bmp": "Images", ".webp": "Images", ".svg": "Images", ".ico": "Images",
-        ".tiff": "Images",
-
-        # Video formats
-        ".mp4": "Videos", ".mkv": "Videos", ".avi": "Videos", ".mov": "Videos",
-        ".wmv": "Videos", ".flv": "Videos", ".webm": "Videos", ".m4v": "Videos",
-
-        # Audio/Music formats
-        ".mp3": "Music", ".wav": "Music", ".flac": "Music", ".aac": "Music",
-        ".ogg": "Music", ".m4a": "Music", ".wma": "Music",
-
-        # Document formats
-        ".pdf": "Documents", ".txt": "Documents", ".doc": "Documents",
-        ".docx": "Documents", ".xls": "Documents", ".xlsx": "Documents",
-        ".ppt": "Documents", ".pptx": "Documents",
-
-        # Programs / installers
-        ".exe": "Programs", ".msi": "Programs", ".deb": "Programs",
-        ".dmg": "Programs",
-
-        # Compressed archives
-        ".zip": "Archives", ".rar": "Archives", ".7z": "Archives",
-        ".tar": "Archives", ".gz": "Archives", ".bz2": "Archives",
-    }
-
-    return mapping.get(ext, "Others")
+    return _EXT_CATEGORY.get(ext.lower(), "Others")
 
 
 # -------------------------------------------------------------------
@@ -152,60 +198,117 @@ def get_category(ext):
 # Also logs everything AND prepares undo instructions.
 # -------------------------------------------------------------------
 
-def organize():
-    """Sorts files into category folders and saves undo info."""
+def organize_iter():
+    """
+    Does the actual sorting, yielding (files_moved_so_far, filename) after
+    every move so the caller (menu now, maybe a GUI later) can show
+    progress or cancel without the whole sort blocking in one call.
+    """
     ensure_log_folder()
-    log(f"Starting organization of: {SOURCE_FOLDER}")
-
-    moves = []                        # List of (new_path, old_path) used for undo
-    category_count = defaultdict(int) # How many files go into each category
-
-    for item in SOURCE_FOLDER.iterdir():
-        # Ignore folders and ignore the script itself
-        if item.is_file() and item.name != "organizer.py":
-
-            # Determine file category
-            category = get_category(item.suffix)
-
-            # Create category folder if needed
-            dest_folder = SOURCE_FOLDER / category
-            dest_folder.mkdir(exist_ok=True)
 
-            # Destination path
-            dest_path = dest_folder / item.name
+    undo_lines = []                   # "new_path|old_path" strings used for undo
+    existing_names = {}               # category → set of names already in its folder
+
+    # Pre-compute every category's destination folder path once — doing
+    # SOURCE_FOLDER / category per file re-joins the same strings over
+    # and over.
+    dest_folders = {cat: str(SOURCE_FOLDER / cat) for cat in ALL_CATEGORIES}
+
+    # Every category is a known key, so a pre-seeded plain dict counts
+    # without defaultdict's __missing__ machinery.
+    category_count = dict.fromkeys(ALL_CATEGORIES, 0)
+
+    moved_msgs = []                   # Buffered "MOVED" lines, flushed after the loop
+
+    # Open the session log ONCE and keep it open for the whole sort.
+    with open(session_log_file(), "w", buffering=1 << 16, encoding="utf-8") as fh:
+        log(f"Starting organization of: {SOURCE_FOLDER}", fh)
+
+        # scandir gives us the file type straight from the directory read,
+        # so we skip one stat() syscall per entry compared to iterdir().
+        with os.scandir(SOURCE_FOLDER) as entries:
+            for entry in entries:
+                # Ignore folders and our own files (script, config, undo log)
+                if not entry.is_file(follow_symlinks=False) or entry.name in IGNORED:
+                    continue
+
+                name = entry.name
+                stem, suffix = os.path.splitext(name)
+
+                # Determine file category (direct dict lookup — hot path)
+                category = _EXT_CATEGORY.get(suffix.lower(), "Others")
+
+                # First file of this category → create the folder and index
+                # its current contents ONCE, so duplicate checks below are
+                # plain set lookups instead of stat() syscalls.
+                dest_folder_str = dest_folders[category]
+                if category not in existing_names:
+                    os.makedirs(dest_folder_str, exist_ok=True)
+                    existing_names[category] = set(os.listdir(dest_folder_str))
+                names_in_dest = existing_names[category]
+
+                # Handle duplicate filenames (file_1.png, file_2.png, etc.)
+                new_name = name
+                if new_name in names_in_dest:
+                    i = 1
+                    while f"{stem}_{i}{suffix}" in names_in_dest:
+                        i += 1
+                    new_name = f"{stem}_{i}{suffix}"
+                names_in_dest.add(new_name)
+
+                # Destination path (string join — cheaper than Path division)
+                dest_path_str = os.path.join(dest_folder_str, new_name)
+
+                # Actually move the file. We always move within
+                # SOURCE_FOLDER, so a plain rename (one syscall) works;
+                # shutil.move is only the fallback for the odd case of a
+                # category folder living on another filesystem.
+                try:
+                    os.replace(entry.path, dest_path_str)
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        raise
+                    shutil.move(entry.path, dest_path_str)
+
+                # Save move details for undo (plain strings — no Path pairs)
+                undo_lines.append(dest_path_str + "|" + entry.path)
+                category_count[category] += 1
+
+                # Buffer the message instead of printing + writing per file;
+                # when the move is just a rename, logging would dominate.
+                moved_msgs.append(f"MOVED: {name} → {category}/")
+
+                yield (len(moved_msgs), name)
+
+        # Flush all the buffered move messages in one print and one write.
+        if moved_msgs:
+            block = "\n".join(moved_msgs)
+            print(block)
+            fh.write(block + "\n")
+
+        # Report empty categories to log in one line.
+        empty = [cat for cat in sorted(ALL_CATEGORIES) if category_count[cat] == 0]
+        if empty:
+            log("Empty categories: " + ", ".join(empty), fh)
+
+        total = sum(category_count.values())
+        log(f"Organization complete! {total} files moved.\n", fh)
+
+        # Save undo actions to a file (one write for the whole session)
+        UNDO_FILE.write_text("\n".join(undo_lines), encoding="utf-8")
+
+        log("Undo info saved.", fh)
 
-            # Handle duplicate filenames (file_1.png, file_2.png, etc.)
-            if dest_path.exists():
-                i = 1
-                while dest_path.exists():
-                    new_name = f"{item.stem}_{i}{item.suffix}"
-                    dest_path = dest_folder / new_name
-                    i += 1
 
-            # Actually move the file
-            shutil.move(str(item), str(dest_path))
-
-            # Save move details for undo
-            moves.append((dest_path, item))
-            category_count[category] += 1
-
-            log(f"MOVED: {item.name} → {category}/")
-
-    # Report empty categories to log
-    all_categories = {"Images","Videos","Music","Documents","Programs","Archives","Others"}
-    for cat in all_categories:
-        if category_count[cat] == 0:
-            log(f"No {cat.lower()} files were found.")
-
-    total = sum(category_count.values())
-    log(f"Organization complete! {total} files moved.\n")
-
-    # Save undo actions to a file
-    with open(UNDO_FILE, "w", encoding="utf-8") as f:
-        for new_path, old_path in moves:
-            f.write(f"{new_path}|{old_path}\n")
-
-    log("Undo info saved.")
+def organize():
+    """Sorts files into category folders and saves undo info."""
+    moved = 0
+    for moved, _name in organize_iter():
+        # Carriage-return progress meter so huge sorts stay responsive.
+        if moved % 500 == 0:
+            print(f"\r{moved} files moved…", end="", flush=True)
+    if moved >= 500:
+        print()   # Finish the progress line
 
 
 # -------------------------------------------------------------------
@@ -221,30 +324,48 @@ def undo():
 
     print("Undoing the last sort...")
     count = 0
-
-    with open(UNDO_FILE, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-
-            new_path_str, old_path_str = line.split("|", 1)
-
-            new_path = Path(new_path_str)
-            old_path = Path(old_path_str)
-
-            # Move file back if it still exists
-            if new_path.exists():
-                old_path.parent.mkdir(exist_ok=True)
-                shutil.move(str(new_path), str(old_path))
-                print(f"Restored → {old_path.name}")
-                count += 1
-
-    # Remove empty category folders
-    for folder_name in ["Images","Videos","Music","Documents","Programs","Archives","Others"]:
-        folder = SOURCE_FOLDER / folder_name
-        if folder.exists() and not any(folder.iterdir()):
-            folder.rmdir()
+    parents_made = set()   # Parent dirs we've already ensured exist
+
+    # One read + splitlines beats per-line iteration and stripping when
+    # the undo log is large.
+    data = UNDO_FILE.read_text(encoding="utf-8")
+    entries = [line for line in data.splitlines() if line]
+
+    for idx, line in enumerate(entries):
+        new_path_str, old_path_str = line.split("|", 1)
+
+        # Move file back if it still exists — plain string paths and a
+        # direct rename, same fast path as organize().
+        if os.path.exists(new_path_str):
+            parent = os.path.dirname(old_path_str)
+            if parent not in parents_made:
+                os.makedirs(parent, exist_ok=True)
+                parents_made.add(parent)
+
+            try:
+                os.replace(new_path_str, old_path_str)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(new_path_str, old_path_str)
+
+            print(f"Restored → {os.path.basename(old_path_str)}")
+            count += 1
+
+        # Checkpoint: every 100 entries, rewrite the unfinished tail so an
+        # interrupted undo can simply be run again to resume. (Replaying a
+        # restored entry is harmless — the exists() check skips it.)
+        if (idx + 1) % 100 == 0:
+            UNDO_FILE.write_text("\n".join(entries[idx + 1:]), encoding="utf-8")
+
+    # Remove empty category folders. rmdir already fails if the folder
+    # is missing or non-empty, so we just try it — no pre-check syscalls.
+    source_str = str(SOURCE_FOLDER)
+    for folder_name in ALL_CATEGORIES:
+        try:
+            os.rmdir(os.path.join(source_str, folder_name))
+        except OSError:
+            pass
 
     # Delete undo file once finished
     UNDO_FILE.unlink()